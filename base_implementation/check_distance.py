@@ -0,0 +1,81 @@
+import sys
+
+import numpy as np
+
+from repositories.exact_repository import ExactSearchRepository
+from services.distance_service import DistanceService
+from services.prediction_service import PredictionService
+
+# PredictionService.predict_authors sends at most this many queries per search
+SEARCH_BATCH = 1000
+WORKERS = 8
+
+
+def check_parallel_plan() -> list:
+    """The thread pool must get more than one task for the searches the repo makes."""
+    failures = []
+    for n_queries, n_base in [(SEARCH_BATCH, 1_000_000), (SEARCH_BATCH, 1045), (1, 1_000_000)]:
+        tasks, _ = DistanceService.plan_tiles(n_queries, n_base, memory_budget_mb=256, workers=WORKERS)
+        if len(tasks) < 2:
+            failures.append(f"{n_queries} consultas x {n_base} vetores: apenas {len(tasks)} tarefa(s)")
+    return failures
+
+
+def check_exact_results() -> list:
+    """topk must match a brute-force search for every tiling."""
+    failures = []
+    rng = np.random.default_rng(0)
+    queries = rng.random((60, 8))
+    base = rng.random((301, 8))
+
+    for metric in DistanceService.SUPPORTED_METRICS:
+        prepared_queries, _ = DistanceService.prepare_vectors(queries, metric)
+        prepared_base, _ = DistanceService.prepare_vectors(base, metric)
+        if metric == 'L2':
+            expected = ((queries[:, None, :] - base[None, :, :]) ** 2).sum(axis=2)
+        else:
+            expected = -(prepared_queries.astype(np.float64) @ prepared_base.astype(np.float64).T)
+        expected = np.sort(expected, axis=1)
+
+        for k in [1, 5]:
+            for memory_budget_mb in [0.001, 0.05, 64]:
+                _, distances = DistanceService.topk(queries, base, k=k, metric=metric,
+                                                    memory_budget_mb=memory_budget_mb, workers=WORKERS)
+                if not np.allclose(distances, expected[:, :k], atol=1e-4):
+                    failures.append(f"{metric}, k={k}, orçamento={memory_budget_mb}MB: distâncias divergem")
+    return failures
+
+
+def check_empty_repository() -> list:
+    repo = ExactSearchRepository(collection_name='check', dimensions_count=2)
+    if repo.search([[0.0, 1.0], [1.0, 0.0]]) != [[], []]:
+        return ["repositório vazio: search não retorna uma lista vazia por consulta"]
+
+    # Inserting nothing must leave the repository empty and still usable
+    repo.insert_data([])
+    if repo.search([[0.0, 1.0], [1.0, 0.0]]) != [[], []]:
+        return ["insert_data([]): search não retorna uma lista vazia por consulta"]
+
+    messages = [{'nomePessoa': 'Human 1'}, {'nomePessoa': 'Human 2'}]
+    results = PredictionService(milvus_repo=repo).evaluate_predictions([[0.0, 1.0], [1.0, 0.0]], messages)
+    if results['total_predictions'] != len(messages):
+        return ["repositório vazio: total_predictions diferente do número de mensagens"]
+
+    repo.insert_data([{'id': 0, 'author': 'Human 1', 'vector': [1.0, 0.0]}])
+    repo.insert_data([])
+    hits = repo.search([[0.9, 0.1]])
+    if len(hits) != 1 or [hit['id'] for hit in hits[0]] != [0]:
+        return ["insert_data([]) após uma inserção: resultado de search incorreto"]
+    return []
+
+
+def main() -> int:
+    failures = check_parallel_plan() + check_exact_results() + check_empty_repository()
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    print("Busca exata: OK" if not failures else f"Busca exata: {len(failures)} falha(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
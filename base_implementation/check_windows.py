@@ -0,0 +1,73 @@
+import sys
+
+import pandas as pd
+
+import init
+from repositories.exact_repository import ExactSearchRepository
+from services.aggregation_service import AggregationService
+from services.prediction_service import PredictionService
+
+CHAT = [
+    ('Human 1', 'hi there'), ('Human 1', 'how are you doing today?'), ('Human 1', 'ok'),
+    ('Human 2', 'fine, thanks!'), ('Human 2', 'and you'),
+    ('Human 1', 'lol'),
+    ('Human 2', 'what are you up to this weekend, anything fun planned?'), ('Human 2', 'ok'),
+]
+
+
+class TextStatsStylo:
+    """Stand-in for StyloMetrix: a few text statistics per column, plus a non-numeric one to clean."""
+
+    def transform(self, texts: list) -> pd.DataFrame:
+        rows = []
+        for text in texts:
+            words = text.split()
+            stats = [len(text), len(words), text.count(' '), text.count('?'), text.count(','),
+                     sum(len(word) for word in words) / max(1, len(words))]
+            rows.append({'text': text, **{f"m{i}": stats[i % len(stats)] * (i + 1) for i in range(180)}})
+        return pd.DataFrame(rows)
+
+
+class RecordingRepository(ExactSearchRepository):
+    def search(self, query_vectors: list, limit: int = 1):
+        self.last_queries = query_vectors
+        return super().search(query_vectors, limit=limit)
+
+
+def check_window_queries() -> list:
+    """predict_window must query with the same vector init.py stores for that window."""
+    failures = []
+    stylo = TextStatsStylo()
+    messages = [{'nomePessoa': author, 'texto': text} for author, text in CHAT]
+
+    for window_tokens, window_turns in [(None, None), (4, None), (None, 2)]:
+        windows = AggregationService.aggregate_windows(messages, window_tokens, window_turns)
+        stored = init.extract_vectors([window['texto'] for window in windows], stylo=stylo)
+
+        repo = RecordingRepository(collection_name='check', dimensions_count=len(init.SELECTED_METRICS))
+        repo.insert_data([{'id': i, 'author': window['nomePessoa'], 'vector': vector}
+                          for i, (window, vector) in enumerate(zip(windows, stored))])
+        prediction_service = PredictionService(milvus_repo=repo, stylo=stylo)
+
+        for window, vector in zip(windows, stored):
+            texts = [msg['texto'] for msg in messages[window['start_index']:window['end_index'] + 1]]
+            prediction_service.predict_window(texts, init.SELECTED_METRICS)
+            if repo.last_queries != [vector]:
+                failures.append(f"janela {window['start_index']}-{window['end_index']} "
+                                f"(tokens={window_tokens}, turnos={window_turns}): vetor difere do armazenado")
+    return failures
+
+
+def main() -> int:
+    # Keep the check from writing metric caches
+    init.CACHE_DIR = None
+
+    failures = check_window_queries()
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    print("Janelas: OK" if not failures else f"Janelas: {len(failures)} falha(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from chat_reader import read_human_chat
+from services.deduplication_service import DeduplicationService
+from services.distance_service import DistanceService
+from services.prediction_service import PredictionService
+
+
+def load_feature_sets(path: str) -> dict:
+    """Read candidate feature sets from JSON: either {"name": [indices]} or [[indices], ...]."""
+    with open(path, 'r') as f:
+        feature_sets = json.load(f)
+
+    if isinstance(feature_sets, list):
+        feature_sets = {f"set_{i + 1}": features for i, features in enumerate(feature_sets)}
+
+    return {name: [int(feature) for feature in features] for name, features in feature_sets.items()}
+
+
+class FeatureSetComparison:
+    """1-NN evaluation of many feature sets over features extracted once.
+
+    Dot products and squared norms are additive over features, so they are
+    computed once per group of features shared by the same sets and summed
+    per set, instead of searching a new Milvus collection for every set.
+    Test rows are processed in blocks so the per-group matrices stay within
+    memory_budget_mb.
+
+    With deduplicate=True training messages are collapsed as in init.py
+    (DEDUPLICATE): repeated texts keep one row, and rows whose vectors match
+    within a set predict the majority author of their group.
+    """
+
+    def __init__(self, training_metrics, testing_metrics, training_messages: list, testing_messages: list,
+                 metric: str = 'COSINE', memory_budget_mb: float = 1024, deduplicate: bool = False):
+        if metric not in DistanceService.SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+
+        self.training_entries = None
+        if deduplicate:
+            self.training_entries, rows = DeduplicationService.collapse_by_text_with_rows(training_messages)
+            print(f"Deduplicação: {len(training_messages)} -> {len(rows)} mensagens de treino")
+            training_metrics = np.asarray(training_metrics)[rows]
+            training_messages = self.training_entries
+            # Vector keys are taken in float64, like the vectors init.py inserts
+            self.training_vectors = np.asarray(training_metrics, dtype=np.float64)
+
+        self.training_metrics = np.asarray(training_metrics, dtype=np.float32)
+        self.testing_metrics = np.asarray(testing_metrics, dtype=np.float32)
+        self.training_authors = np.array([msg['nomePessoa'] for msg in training_messages])
+        self.testing_messages = testing_messages
+        self.metric = metric
+        self.memory_budget_mb = memory_budget_mb
+
+    def _nearest(self, membership: list, partials: list, base_sq_norms: np.ndarray) -> np.ndarray:
+        gram, query_sq_norms = partials[membership[0]]
+        gram, query_sq_norms = gram.copy(), query_sq_norms.copy()
+        for group_idx in membership[1:]:
+            group_gram, group_query_sq_norms = partials[group_idx]
+            gram += group_gram
+            query_sq_norms += group_query_sq_norms
+
+        scores = DistanceService.scores_from_products(gram, query_sq_norms, base_sq_norms, self.metric)
+        return np.argmin(scores, axis=1)
+
+    def _authors(self, features: list) -> np.ndarray:
+        """Author predicted for a hit on each training row when evaluating features."""
+        if self.training_entries is None:
+            return self.training_authors
+        return np.array(DeduplicationService.majority_by_vector(
+            self.training_entries, self.training_vectors[:, features]))
+
+    def evaluate(self, feature_sets: dict, workers: int = None) -> list:
+        """Evaluate every named feature set and return rows ranked by accuracy."""
+        total_features = self.training_metrics.shape[1]
+        for name, features in feature_sets.items():
+            # As in ForwardSelection.evaluate_feature_set: with one feature every
+            # non-zero vector has COSINE similarity 1 and the 1-NN is arbitrary
+            if len(set(features)) < 2:
+                raise ValueError(f"Conjunto '{name}' precisa de pelo menos 2 features")
+            invalid = [feature for feature in features if not 0 <= feature < total_features]
+            if invalid:
+                raise ValueError(f"Conjunto '{name}' contém índices inválidos: {invalid}")
+
+        names = list(feature_sets)
+        groups, membership = DistanceService.partition_feature_sets([feature_sets[name] for name in names])
+        print(f"Avaliando {len(names)} conjuntos de features ({len(groups)} grupos compartilhados)...")
+
+        # One float32 Gram matrix per group is shared by all sets; each running
+        # set adds its own score matrices on top
+        workers = workers or os.cpu_count() or 1
+        cells = DistanceService.cells_in_budget(
+            self.memory_budget_mb, workers,
+            bytes_per_cell=DistanceService.BYTES_PER_SCORE_CELL,
+            shared_bytes_per_cell=4 * len(groups)
+        )
+        block_rows = max(1, cells // len(self.training_metrics))
+
+        nearest = [[] for _ in names]
+        # numpy releases the GIL inside BLAS calls, so threads are enough here
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Training side does not depend on the query block: slice and norm it once
+            base_slices = list(executor.map(
+                lambda features: DistanceService.feature_slice(self.training_metrics, features), groups))
+            set_base_sq_norms = [sum(base_slices[group_idx][1] for group_idx in members) for members in membership]
+
+            for start in range(0, len(self.testing_metrics), block_rows):
+                queries = self.testing_metrics[start:start + block_rows]
+                partials = list(executor.map(
+                    lambda group: DistanceService.partial_products(queries, base_slices[group[0]], group[1]),
+                    enumerate(groups)
+                ))
+                for set_idx, indices in enumerate(executor.map(
+                        lambda set_idx: self._nearest(membership[set_idx], partials, set_base_sq_norms[set_idx]),
+                        range(len(names)))):
+                    nearest[set_idx].append(indices)
+
+        results = [
+            PredictionService.summarize_predictions(
+                self._authors(feature_sets[name])[np.concatenate(indices)].tolist(), self.testing_messages)
+            for name, indices in zip(names, nearest)
+        ]
+
+        rows = []
+        for name, result in zip(names, results):
+            rows.append({
+                'name': name,
+                'features_count': len(set(feature_sets[name])),
+                'accuracy': result['accuracy'],
+                'correct_predictions': result['correct_predictions'],
+                'total_predictions': result['total_predictions'],
+                'human1_correct': result['human1_correct'],
+                'human2_correct': result['human2_correct'],
+                'features': sorted(set(feature_sets[name]))
+            })
+
+        rows.sort(key=lambda row: row['accuracy'], reverse=True)
+        for rank, row in enumerate(rows, start=1):
+            row['rank'] = rank
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara vários conjuntos de features em uma única execução.')
+    parser.add_argument('feature_sets_file', help='JSON com os conjuntos de features candidatos')
+    parser.add_argument('--chat-file', default='/home/matheus/github/Clustering/StyloMetrix/Datasets/human_chat.txt')
+    parser.add_argument('--cache-dir', default='./metrics_cache', help='Diretório do cache de métricas extraídas')
+    parser.add_argument('--output', default='./feature_set_comparison.csv')
+    parser.add_argument('--metric', default='COSINE', choices=DistanceService.SUPPORTED_METRICS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--memory-budget-mb', type=float, default=1024)
+    parser.add_argument('--deduplicate', action='store_true',
+                        help='Colapsa mensagens de treino repetidas, como DEDUPLICATE em init.py')
+    args = parser.parse_args()
+
+    import pandas as pd
+    from services.feature_extraction_service import FeatureExtractionService
+
+    feature_sets = load_feature_sets(args.feature_sets_file)
+    chat_messages = read_human_chat(args.chat_file)
+    texts = [msg['texto'] for msg in chat_messages]
+
+    training_size = int(0.7 * len(texts))
+    training_messages = chat_messages[:training_size]
+    testing_messages = chat_messages[training_size:]
+
+    training_metrics = FeatureExtractionService.extract(None, texts[:training_size], cache_dir=args.cache_dir)
+    testing_metrics = FeatureExtractionService.extract(None, texts[training_size:], cache_dir=args.cache_dir)
+
+    comparison = FeatureSetComparison(
+        training_metrics.to_numpy(),
+        testing_metrics.to_numpy(),
+        training_messages,
+        testing_messages,
+        metric=args.metric,
+        memory_budget_mb=args.memory_budget_mb,
+        deduplicate=args.deduplicate
+    )
+    rows = comparison.evaluate(feature_sets, workers=args.workers)
+
+    table = pd.DataFrame(rows)[['rank', 'name', 'features_count', 'accuracy', 'correct_predictions',
+                                'total_predictions', 'human1_correct', 'human2_correct', 'features']]
+    table.to_csv(args.output, index=False)
+
+    print(table.drop(columns=['features']).to_string(index=False))
+    print(f"\nTabela salva em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
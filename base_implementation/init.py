@@ -1,15 +1,14 @@
-import stylo_metrix as sm
 from chat_reader import read_human_chat
-from repositories.milvus_repository import MilvusRepository
-from services.pandas_service import PandasService
-from services.numpy_service import NumpyService
 from models.message import Message
-from services.prediction_service import PredictionService
-from services.visualization_service import VisualizationService
+from services.aggregation_service import AggregationService
 
-chat_messages = read_human_chat('/home/matheus/github/Clustering/StyloMetrix/Datasets/human_chat.txt')
+# Heavy dependencies (stylo_metrix/spaCy, pymilvus, pandas, matplotlib) are
+# imported inside the stage that needs them, so importing this module is cheap.
 
-stylo = sm.StyloMetrix('en')
+CHAT_FILE = '/home/matheus/github/Clustering/StyloMetrix/Datasets/human_chat.txt'
+
+# Extracted metrics are cached per list of texts; None disables the cache
+CACHE_DIR = './metrics_cache'
 
 SELECTED_METRICS = [
     0,   # Verbs
@@ -41,62 +40,109 @@ SELECTED_METRICS = [
     174, # Past tenses
 ]
 
-milvus_repo = MilvusRepository(collection_name="demo_collection", dimensions_count=len(SELECTED_METRICS))
-prediction_service = PredictionService(milvus_repo=milvus_repo, stylo=stylo)
+# Collapse repeated training messages ("ok", "lol", ...) into weighted entries.
+# Off by default, as in compare_feature_sets.py and run_selection.py (--deduplicate
+# in both); use the same setting everywhere to keep their accuracies comparable
+DEDUPLICATE = False
+
+# Merge consecutive messages of the same author into windows before extraction
+# (e.g. WINDOW_TOKENS = 30 or WINDOW_TURNS = 5); None for both keeps one row per message
+WINDOW_TOKENS = None
+WINDOW_TURNS = None
+
+# Render charts without opening windows; None decides from the matplotlib backend
+HEADLESS = None
+
+
+def extract_vectors(texts: list, stylo=None) -> list:
+    from services.feature_extraction_service import FeatureExtractionService
+    from services.numpy_service import NumpyService
+
+    metrics = FeatureExtractionService.extract(stylo, texts, cache_dir=CACHE_DIR)
+    metrics = metrics.iloc[:, SELECTED_METRICS]
+
+    vectors = []
+    for i in range(len(metrics)):
+        vectors.append(NumpyService.to_float64_list(metrics.iloc[i]))
+    return vectors
+
+
+def main():
+    from repositories.milvus_repository import MilvusRepository
+    from services.deduplication_service import DeduplicationService
+    from services.prediction_service import PredictionService
+
+    chat_messages = read_human_chat(CHAT_FILE)
+
+    milvus_repo = MilvusRepository(collection_name="demo_collection", dimensions_count=len(SELECTED_METRICS))
+    prediction_service = PredictionService(milvus_repo=milvus_repo)
+
+    texts = [msg['texto'] for msg in chat_messages]
+
+    training_size = int(0.7 * len(texts))
+    testing_size = len(texts) - training_size
 
-texts = [msg['texto'] for msg in chat_messages]
+    training_messages = chat_messages[:training_size]
+    testing_messages = chat_messages[training_size:]
+    if WINDOW_TOKENS or WINDOW_TURNS:
+        training_messages = AggregationService.aggregate_windows(training_messages, WINDOW_TOKENS, WINDOW_TURNS)
+        testing_messages = AggregationService.aggregate_windows(testing_messages, WINDOW_TOKENS, WINDOW_TURNS)
+        print(f"Janelas: {training_size} -> {len(training_messages)} (treino), "
+              f"{testing_size} -> {len(testing_messages)} (teste)")
 
-training_size = int(0.7 * len(texts))
-testing_size = len(texts) - training_size
+    training_entries_count = len(training_messages)
+    if DEDUPLICATE:
+        training_messages = DeduplicationService.collapse_by_text(training_messages)
 
-training_texts = texts[:training_size]
-training_messages = chat_messages[:training_size]
+    training_vectors = extract_vectors([msg['texto'] for msg in training_messages])
 
-training_metrics = stylo.transform(training_texts)
+    if DEDUPLICATE:
+        training_messages, training_vectors = DeduplicationService.collapse_by_vector(training_messages, training_vectors)
+        print(f"Deduplicação: {training_entries_count} -> {len(training_messages)} entradas")
 
-PandasService.clean_non_numeric_metrics(training_metrics)
+    data = []
+    for i in range(len(training_vectors)):
+        data.append(Message(
+            id=i,
+            content=training_messages[i]['texto'],
+            author=training_messages[i]['nomePessoa'],
+            vector=training_vectors[i],
+            weight=training_messages[i].get('weight', 1),
+            author_counts=training_messages[i].get('author_counts')
+        ))
 
-training_metrics = training_metrics.iloc[:, SELECTED_METRICS]
+    milvus_repo.insert_data([msg.to_dict() for msg in data])
 
-data = []
-for i in range(len(training_metrics)):
-    data.append(Message(
-        id=i,
-        content=training_texts[i],
-        author=training_messages[i]['nomePessoa'],
-        vector=NumpyService.to_float64_list(training_metrics.iloc[i])
-    ))
+    testing_vectors = extract_vectors([msg['texto'] for msg in testing_messages])
 
-milvus_repo.insert_data([msg.to_dict() for msg in data])
+    results = prediction_service.evaluate_predictions(testing_vectors, testing_messages)
 
-testing_texts = texts[training_size:]
-testing_messages = chat_messages[training_size:]
+    create_charts(results)
 
-testing_metrics = stylo.transform(testing_texts)
 
-PandasService.clean_non_numeric_metrics(testing_metrics)
+def create_charts(results: dict):
+    from services.visualization_service import VisualizationService
 
-testing_metrics = testing_metrics.iloc[:, SELECTED_METRICS]
+    headless = HEADLESS if HEADLESS is not None else not VisualizationService.has_interactive_backend()
+    if headless:
+        VisualizationService.configure_headless(dpi=300)
 
-testing_vectors = []
-for i in range(len(testing_metrics)):
-    vector = NumpyService.to_float64_list(testing_metrics.iloc[i])
-    testing_vectors.append(vector)
+    VisualizationService.create_accuracy_bar_chart(
+        correct_predictions=results['correct_predictions'],
+        incorrect_predictions=results['incorrect_predictions'],
+        output_path='./accuracy_chart.png'
+    )
+    VisualizationService.create_detailed_bar_chart(
+        correct_predictions=results['correct_predictions'],
+        incorrect_predictions=results['incorrect_predictions'],
+        human1_correct=results['human1_correct'],
+        human1_incorrect=results['human1_incorrect'],
+        human2_correct=results['human2_correct'],
+        human2_incorrect=results['human2_incorrect'],
+        output_path='./detailed_accuracy_chart.png'
+    )
+    VisualizationService.create_confusion_matrix(results, output_path='./confusion_matrix.png')
 
-results = prediction_service.evaluate_predictions(testing_vectors, testing_messages)
 
-VisualizationService.create_accuracy_bar_chart(
-    correct_predictions=results['correct_predictions'],
-    incorrect_predictions=results['incorrect_predictions'],
-    output_path='./accuracy_chart.png'
-)
-VisualizationService.create_detailed_bar_chart(
-    correct_predictions=results['correct_predictions'],
-    incorrect_predictions=results['incorrect_predictions'],
-    human1_correct=results['human1_correct'],
-    human1_incorrect=results['human1_incorrect'],
-    human2_correct=results['human2_correct'],
-    human2_incorrect=results['human2_incorrect'],
-    output_path='./detailed_accuracy_chart.png'
-)
-VisualizationService.create_confusion_matrix(results, output_path='./confusion_matrix.png')
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
 class Message:
-    def __init__(self, id: int, content: str, author: str, vector: list = None):
+    def __init__(self, id: int, content: str, author: str, vector: list = None,
+                 weight: int = 1, author_counts: dict = None):
         self.id = id
         self.content = content
         self.author = author
         self.vector = vector
+        self.weight = weight
+        self.author_counts = author_counts if author_counts is not None else {author: weight}
 
     def to_dict(self):
         return {
             "id": self.id,
             "content": self.content,
             "author": self.author,
-            "vector": self.vector
+            "vector": self.vector,
+            "weight": self.weight,
+            "author_counts": self.author_counts
         }
\ No newline at end of file
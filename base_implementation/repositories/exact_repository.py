@@ -0,0 +1,60 @@
+import numpy as np
+
+from services.distance_service import DistanceService
+
+
+class ExactSearchRepository:
+    """In-memory drop-in for MilvusRepository backed by DistanceService.topk.
+
+    Search results have the same shape as MilvusClient.search, so services can
+    switch between the two without changes.
+    """
+
+    def __init__(self, collection_name: str, dimensions_count: int, metric: str = 'COSINE',
+                 memory_budget_mb: float = 256, workers: int = None):
+        self.collection_name = collection_name
+        self.dimensions_count = dimensions_count
+        self.metric = metric
+        self.memory_budget_mb = memory_budget_mb
+        self.workers = workers
+        self.entities = []
+        self.base = None
+
+    def insert_data(self, data: list):
+        if not data:
+            return
+
+        vectors = [item['vector'] for item in data]
+        if any(len(vector) != self.dimensions_count for vector in vectors):
+            raise ValueError(f"Expected vectors with {self.dimensions_count} dimensions")
+
+        self.entities.extend({key: value for key, value in item.items() if key != 'vector'} for item in data)
+        prepared = DistanceService.prepare_vectors(vectors, self.metric)
+        if self.base is None:
+            self.base = prepared
+        else:
+            self.base = (np.concatenate([self.base[0], prepared[0]]), np.concatenate([self.base[1], prepared[1]]))
+
+    def search(self, query_vectors: list, limit: int = 1):
+        if self.base is None or not query_vectors:
+            # Like Milvus: one (empty) hit list per query
+            return [[] for _ in query_vectors]
+
+        indices, distances = DistanceService.topk(
+            DistanceService.prepare_vectors(query_vectors, self.metric),
+            self.base,
+            k=limit,
+            metric=self.metric,
+            memory_budget_mb=self.memory_budget_mb,
+            workers=self.workers,
+            prepared=True
+        )
+
+        # Milvus reports COSINE as a similarity, L2 as a squared distance
+        sign = -1 if self.metric == 'COSINE' else 1
+        return [
+            [{"id": self.entities[index].get("id", index), "distance": sign * float(distance),
+              "entity": self.entities[index]}
+             for index, distance in zip(row_indices, row_distances)]
+            for row_indices, row_distances in zip(indices, distances)
+        ]
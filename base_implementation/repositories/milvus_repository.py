@@ -20,5 +20,5 @@ class MilvusRepository:
             collection_name=self.collection_name,
             data=query_vectors,
             limit=limit,
-            output_fields=["author", "text"]
+            output_fields=["author", "text", "author_counts"]
         )
\ No newline at end of file
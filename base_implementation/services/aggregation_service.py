@@ -0,0 +1,47 @@
+class AggregationService:
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        return len(text.split())
+
+    @staticmethod
+    def aggregate_windows(chat_messages: list, window_tokens: int = None, window_turns: int = None) -> list:
+        """Merge consecutive messages of the same author into windows.
+
+        A window is closed when the author changes, once it holds at least
+        `window_tokens` tokens, or once it holds `window_turns` messages. With
+        neither limit set, each run of messages by the same author becomes one
+        window. Windows keep the message keys ('nomePessoa', 'texto') plus
+        'message_count' and the [start_index, end_index] range they cover.
+        """
+        windows = []
+        current = None
+
+        for i, msg in enumerate(chat_messages):
+            if current is not None and current['nomePessoa'] != msg['nomePessoa']:
+                windows.append(current)
+                current = None
+
+            if current is None:
+                current = {
+                    'nomePessoa': msg['nomePessoa'],
+                    'texto': msg['texto'],
+                    'message_count': 1,
+                    'token_count': AggregationService.count_tokens(msg['texto']),
+                    'start_index': i,
+                    'end_index': i
+                }
+            else:
+                current['texto'] = f"{current['texto']} {msg['texto']}"
+                current['message_count'] += 1
+                current['token_count'] += AggregationService.count_tokens(msg['texto'])
+                current['end_index'] = i
+
+            if ((window_tokens and current['token_count'] >= window_tokens) or
+                    (window_turns and current['message_count'] >= window_turns)):
+                windows.append(current)
+                current = None
+
+        if current is not None:
+            windows.append(current)
+
+        return windows
@@ -0,0 +1,100 @@
+import hashlib
+
+import numpy as np
+
+
+class DeduplicationService:
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Whitespace insensitive form of a message.
+
+        Case is kept: spaCy tagging is case sensitive, so "OK" and "ok" can yield
+        different metrics; near-identical vectors are merged by collapse_by_vector.
+        """
+        return ' '.join(text.split())
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        return hashlib.sha1(DeduplicationService.normalize_text(text).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def vector_key(vector: list, decimals: int = 6) -> str:
+        """Hash of the vector rounded to `decimals`, so near-identical vectors share a key."""
+        rounded = np.round(np.asarray(vector, dtype=np.float64), decimals) + 0.0  # drops -0.0
+        return hashlib.sha1(rounded.tobytes()).hexdigest()
+
+    @staticmethod
+    def majority_author(author_counts: dict) -> str:
+        """Most frequent author; ties go to the author seen first."""
+        return max(author_counts, key=author_counts.get) if author_counts else None
+
+    @staticmethod
+    def collapse_by_text(chat_messages: list) -> list:
+        """Collapse messages with the same normalized text into weighted entries.
+
+        Each entry keeps the first occurrence's text and adds 'weight' (number of
+        messages collapsed) and 'author_counts' (messages per author);
+        'nomePessoa' becomes the majority author.
+        """
+        return DeduplicationService.collapse_by_text_with_rows(chat_messages)[0]
+
+    @staticmethod
+    def collapse_by_text_with_rows(chat_messages: list) -> tuple:
+        """collapse_by_text, plus the index of the message each entry took its text from.
+
+        Lets callers that already extracted every message reuse those rows
+        instead of extracting the collapsed texts again.
+        """
+        entries = {}
+        rows = []
+        for i, msg in enumerate(chat_messages):
+            key = DeduplicationService.text_key(msg['texto'])
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = {'texto': msg['texto'], 'weight': 0, 'author_counts': {}}
+                rows.append(i)
+            entry['weight'] += msg.get('weight', 1)
+            for author, count in msg.get('author_counts', {msg['nomePessoa']: 1}).items():
+                entry['author_counts'][author] = entry['author_counts'].get(author, 0) + count
+
+        for entry in entries.values():
+            entry['nomePessoa'] = DeduplicationService.majority_author(entry['author_counts'])
+
+        return list(entries.values()), rows
+
+    @staticmethod
+    def collapse_by_vector(entries: list, vectors: list, decimals: int = 6) -> tuple:
+        """Merge entries whose extracted vectors are equal up to `decimals`.
+
+        Returns (entries, vectors) with one item per distinct vector.
+        """
+        merged = {}
+        for entry, vector in zip(entries, vectors):
+            key = DeduplicationService.vector_key(vector, decimals)
+            if key not in merged:
+                merged[key] = ({**entry, 'author_counts': dict(entry['author_counts'])}, vector)
+                continue
+
+            target = merged[key][0]
+            target['weight'] += entry['weight']
+            for author, count in entry['author_counts'].items():
+                target['author_counts'][author] = target['author_counts'].get(author, 0) + count
+            target['nomePessoa'] = DeduplicationService.majority_author(target['author_counts'])
+
+        return [entry for entry, _ in merged.values()], [vector for _, vector in merged.values()]
+
+    @staticmethod
+    def majority_by_vector(entries: list, vectors: list, decimals: int = 6) -> list:
+        """Majority author of the collapse_by_vector group of each entry, in entry order.
+
+        A 1-NN search over the uncollapsed vectors that maps its hit through this
+        list predicts what a search over the collapsed entries would.
+        """
+        keys = [DeduplicationService.vector_key(vector, decimals) for vector in vectors]
+        group_counts = {}
+        for key, entry in zip(keys, entries):
+            counts = group_counts.setdefault(key, {})
+            for author, count in entry['author_counts'].items():
+                counts[author] = counts.get(author, 0) + count
+
+        return [DeduplicationService.majority_author(group_counts[key]) for key in keys]
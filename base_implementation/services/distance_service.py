@@ -0,0 +1,243 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class DistanceService:
+    # MilvusClient quick-setup collections (as created by MilvusRepository) use COSINE
+    SUPPORTED_METRICS = ('COSINE', 'L2')
+    # float32 score + int64 index per cell, plus the merge buffers
+    BYTES_PER_TILE_CELL = 16
+    # scores_from_products: the summed float32 Gram matrix plus up to 3 float32 temporaries (COSINE)
+    BYTES_PER_SCORE_CELL = 16
+
+    @staticmethod
+    def partition_feature_sets(feature_sets: list) -> tuple:
+        """Split the union of feature_sets into disjoint groups of features that
+        belong to exactly the same sets.
+
+        Returns (groups, membership): groups is a list of feature index lists and
+        membership[i] lists the groups whose union is feature_sets[i]. Partial
+        results computed per group can then be shared by every overlapping set.
+        """
+        signatures = {}
+        for set_idx, features in enumerate(feature_sets):
+            for feature in set(features):
+                signatures.setdefault(feature, set()).add(set_idx)
+
+        groups_by_signature = {}
+        for feature in sorted(signatures):
+            groups_by_signature.setdefault(frozenset(signatures[feature]), []).append(feature)
+
+        groups = list(groups_by_signature.values())
+        membership = [[] for _ in feature_sets]
+        for group_idx, signature in enumerate(groups_by_signature):
+            for set_idx in signature:
+                membership[set_idx].append(group_idx)
+
+        return groups, membership
+
+    @staticmethod
+    def feature_slice(vectors: np.ndarray, features: list) -> tuple:
+        """float32 contiguous copy of vectors restricted to features, and its squared row norms."""
+        sliced = np.ascontiguousarray(vectors[:, features], dtype=np.float32)
+        return sliced, np.einsum('ij,ij->i', sliced, sliced)
+
+    @staticmethod
+    def partial_products(queries: np.ndarray, base_slice: tuple, features: list) -> tuple:
+        """Dot products and query squared norms restricted to features, in float32.
+
+        base_slice is feature_slice(base, features), computed once by the caller
+        so that it is reused across query blocks.
+        """
+        q, query_sq_norms = DistanceService.feature_slice(queries, features)
+        return q @ base_slice[0].T, query_sq_norms
+
+    @staticmethod
+    def scores_from_products(gram: np.ndarray, query_sq_norms: np.ndarray, base_sq_norms: np.ndarray,
+                             metric: str = 'COSINE') -> np.ndarray:
+        """Turn dot products into distances (lower is closer) for the given metric."""
+        if metric == 'L2':
+            distances = query_sq_norms[:, None] + base_sq_norms[None, :] - 2 * gram
+            return np.maximum(distances, 0, out=distances)
+        if metric == 'COSINE':
+            # Zero vectors (all metrics empty) get similarity 0 instead of NaN
+            q = np.sqrt(query_sq_norms)
+            b = np.sqrt(base_sq_norms)
+            q[q == 0] = 1
+            b[b == 0] = 1
+            return -(gram / q[:, None]) / b[None, :]
+        raise ValueError(f"Unsupported metric: {metric}")
+
+    @staticmethod
+    def prepare_vectors(vectors, metric: str = 'COSINE') -> tuple:
+        """float32 copy of vectors (unit length for COSINE) and their squared norms."""
+        if metric not in DistanceService.SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        sq_norms = np.einsum('ij,ij->i', vectors, vectors)
+        if metric == 'COSINE':
+            norms = np.sqrt(sq_norms)
+            norms[norms == 0] = 1
+            vectors /= norms[:, None]
+            sq_norms = np.einsum('ij,ij->i', vectors, vectors)
+        return vectors, sq_norms
+
+    @staticmethod
+    def cells_in_budget(memory_budget_mb: float, workers: int, bytes_per_cell: int = BYTES_PER_TILE_CELL,
+                        shared_bytes_per_cell: int = 0) -> int:
+        """Cells (query x base pairs) per tile that fit memory_budget_mb when `workers`
+        tiles of bytes_per_cell each are alive at once, plus shared_bytes_per_cell
+        kept once for the whole tile."""
+        return max(1, int(memory_budget_mb * 1024 * 1024) // (bytes_per_cell * workers + shared_bytes_per_cell))
+
+    @staticmethod
+    def tile_shape(n_queries: int, n_base: int, memory_budget_mb: float, workers: int) -> tuple:
+        """Rows of queries and base vectors per tile so that all workers fit the budget.
+
+        Query tiles are capped at ceil(n_queries / workers) rows so every worker
+        gets at least one of them when there are enough queries.
+        """
+        cells = DistanceService.cells_in_budget(memory_budget_mb, workers)
+        query_cap = max(1, min(1024, math.ceil(n_queries / workers)))
+        query_rows = max(1, min(n_queries, query_cap, cells))
+        base_rows = max(1, min(n_base, cells // query_rows))
+        if base_rows == n_base:
+            query_rows = max(1, min(n_queries, query_cap, cells // n_base))
+        return query_rows, base_rows
+
+    @staticmethod
+    def plan_tiles(n_queries: int, n_base: int, memory_budget_mb: float, workers: int) -> tuple:
+        """Split the search into independent tasks for the thread pool.
+
+        Returns (tasks, base_rows); each task is (query_start, query_stop,
+        base_start, base_stop). When there are fewer query tiles than workers
+        (e.g. a single search batch), the base vectors are also split into
+        chunks so the remaining workers sweep them in parallel.
+        """
+        query_rows, base_rows = DistanceService.tile_shape(n_queries, n_base, memory_budget_mb, workers)
+        query_starts = range(0, n_queries, query_rows)
+
+        wanted_chunks = max(1, workers // max(1, len(query_starts)))
+        if math.ceil(n_base / base_rows) < wanted_chunks:
+            base_rows = max(1, math.ceil(n_base / wanted_chunks))
+        base_tiles = math.ceil(n_base / base_rows)
+        base_chunks = max(1, min(base_tiles, wanted_chunks))
+        # Chunk boundaries fall on tile boundaries, so chunks keep full-size tiles
+        bounds = [min(n_base, round(i * base_tiles / base_chunks) * base_rows) for i in range(base_chunks + 1)]
+
+        tasks = [(start, min(start + query_rows, n_queries), base_start, base_stop)
+                 for start in query_starts
+                 for base_start, base_stop in zip(bounds[:-1], bounds[1:])]
+        return tasks, base_rows
+
+    @staticmethod
+    def _merge_topk(scores: np.ndarray, indices: np.ndarray, k: int) -> tuple:
+        """Keep the k lowest scores of each row, sorted closest first."""
+        rows = np.arange(len(scores))[:, None]
+        if scores.shape[1] > k:
+            keep = np.argpartition(scores, k - 1, axis=1)[:, :k]
+            scores, indices = scores[rows, keep], indices[rows, keep]
+        order = np.argsort(scores, axis=1, kind='stable')
+        return indices[rows, order], scores[rows, order]
+
+    @staticmethod
+    def _topk_query_tile(queries, query_sq_norms, base, base_sq_norms, k, base_rows, metric, base_offset=0):
+        n = len(queries)
+        best_scores = np.full((n, k), np.inf, dtype=np.float32)
+        best_indices = np.full((n, k), -1, dtype=np.int64)
+        rows = np.arange(n)[:, None]
+
+        for start in range(0, len(base), base_rows):
+            stop = min(start + base_rows, len(base))
+            scores = queries @ base[start:stop].T
+            if metric == 'L2':
+                scores *= -2
+                scores += query_sq_norms[:, None]
+                scores += base_sq_norms[None, start:stop]
+                np.maximum(scores, 0, out=scores)
+            else:
+                np.negative(scores, out=scores)
+
+            tile_offset = base_offset + start
+            if k == 1:
+                part = np.argmin(scores, axis=1)[:, None]
+                tile_scores = scores[rows, part]
+                tile_indices = part + tile_offset
+            elif scores.shape[1] > k:
+                part = np.argpartition(scores, k - 1, axis=1)[:, :k]
+                tile_scores = scores[rows, part]
+                tile_indices = part + tile_offset
+            else:
+                tile_scores = scores
+                tile_indices = np.broadcast_to(np.arange(start, stop) + base_offset, scores.shape)
+
+            if k == 1:
+                closer = tile_scores < best_scores
+                best_scores = np.where(closer, tile_scores, best_scores)
+                best_indices = np.where(closer, tile_indices, best_indices)
+                continue
+
+            merged_scores = np.concatenate([best_scores, tile_scores], axis=1)
+            merged_indices = np.concatenate([best_indices, tile_indices], axis=1)
+            keep = np.argpartition(merged_scores, k - 1, axis=1)[:, :k]
+            best_scores = merged_scores[rows, keep]
+            best_indices = merged_indices[rows, keep]
+
+        return DistanceService._merge_topk(best_scores, best_indices, k)
+
+    @staticmethod
+    def topk(queries, base, k: int = 1, metric: str = 'COSINE', memory_budget_mb: float = 256,
+             workers: int = None, prepared: bool = False) -> tuple:
+        """Exact k nearest base vectors of every query, without the full distance matrix.
+
+        Queries and base vectors are split into tiles sized by memory_budget_mb
+        and into tasks by plan_tiles(); each task keeps a running top-k
+        (argpartition) while it sweeps its base tiles, tasks run on `workers`
+        threads and the per-task top-k of each query tile are merged at the end.
+        L2 uses |q|^2 + |b|^2 - 2 q.b on float32. Returns (indices, distances),
+        both n_queries x k and sorted closest first; COSINE distances are negated
+        similarities, L2 distances are squared, as in Milvus.
+        Pass prepared=True when both inputs come from prepare_vectors().
+        """
+        if prepared:
+            queries, query_sq_norms = queries
+            base, base_sq_norms = base
+        else:
+            queries, query_sq_norms = DistanceService.prepare_vectors(queries, metric)
+            base, base_sq_norms = DistanceService.prepare_vectors(base, metric)
+
+        k = min(k, len(base))
+        workers = workers or os.cpu_count() or 1
+        tasks, base_rows = DistanceService.plan_tiles(len(queries), len(base), memory_budget_mb, workers)
+
+        def run(task):
+            query_start, query_stop, base_start, base_stop = task
+            return DistanceService._topk_query_tile(
+                queries[query_start:query_stop], query_sq_norms[query_start:query_stop],
+                base[base_start:base_stop], base_sq_norms[base_start:base_stop],
+                k, base_rows, metric, base_offset=base_start)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(run, tasks))
+
+        by_query_tile = {}
+        for (query_start, query_stop, _, _), (task_indices, task_scores) in zip(tasks, partials):
+            by_query_tile.setdefault((query_start, query_stop), []).append((task_indices, task_scores))
+
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        distances = np.empty((len(queries), k), dtype=np.float32)
+        for (query_start, query_stop), results in by_query_tile.items():
+            if len(results) == 1:
+                indices[query_start:query_stop], distances[query_start:query_stop] = results[0]
+                continue
+            indices[query_start:query_stop], distances[query_start:query_stop] = DistanceService._merge_topk(
+                np.concatenate([scores for _, scores in results], axis=1),
+                np.concatenate([task_indices for task_indices, _ in results], axis=1),
+                k
+            )
+
+        return indices, distances
@@ -0,0 +1,55 @@
+import hashlib
+import os
+from functools import lru_cache
+
+
+class FeatureExtractionService:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def load_stylo(lang: str = 'en'):
+        """Shared StyloMetrix instance; importing it loads spaCy, so it is built on first use only."""
+        import stylo_metrix as sm
+        return sm.StyloMetrix(lang)
+
+    @staticmethod
+    def cache_key(texts: list, lang: str = 'en') -> str:
+        """Stable key for a list of texts, used to name the cache file."""
+        digest = hashlib.sha1(lang.encode('utf-8'))
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    @staticmethod
+    def cache_path(texts: list, cache_dir: str, lang: str = 'en') -> str:
+        return os.path.join(cache_dir, f"metrics_{FeatureExtractionService.cache_key(texts, lang)}.pkl")
+
+    @staticmethod
+    def extract(stylo, texts: list, cache_dir: str = None, lang: str = 'en'):
+        """Run stylo.transform on texts and clean the result, reusing a cached copy when available.
+
+        With stylo=None the shared instance from load_stylo() is used, and only
+        on a cache miss, so cached runs never load spaCy.
+        """
+        import pandas as pd
+        from services.pandas_service import PandasService
+
+        cache_path = None
+        if cache_dir:
+            cache_path = FeatureExtractionService.cache_path(texts, cache_dir, lang)
+            if os.path.exists(cache_path):
+                print(f"Métricas carregadas do cache: {cache_path}")
+                return pd.read_pickle(cache_path)
+
+        if stylo is None:
+            stylo = FeatureExtractionService.load_stylo(lang)
+
+        metrics = stylo.transform(texts)
+        PandasService.clean_non_numeric_metrics(metrics)
+
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            metrics.to_pickle(cache_path)
+            print(f"Métricas salvas no cache: {cache_path}")
+
+        return metrics
@@ -1,29 +1,70 @@
-from repositories.milvus_repository import MilvusRepository
-import stylo_metrix as sm
+from typing import TYPE_CHECKING
+
+from services.deduplication_service import DeduplicationService
+
+if TYPE_CHECKING:
+    import stylo_metrix as sm
+    from repositories.milvus_repository import MilvusRepository
 
 class PredictionService:
-    def __init__(self, milvus_repo: MilvusRepository, stylo: sm.StyloMetrix):
+    def __init__(self, milvus_repo: 'MilvusRepository', stylo: 'sm.StyloMetrix' = None):
         self.milvus_repo = milvus_repo
-        self.stylo = stylo
+        # None: the shared instance is loaded by FeatureExtractionService on first use
+        self._stylo = stylo
 
     def predict_author(self, vector: list, limit: int = 1) -> str:
         search_results = self.milvus_repo.search(query_vectors=[vector], limit=limit)
-        return search_results[0][0]["entity"]["author"] if search_results else None
+        return PredictionService._author_from_hits(search_results[0]) if search_results else None
+
+    def predict_authors(self, vectors: list, limit: int = 1, batch_size: int = 1000) -> list:
+        """Predict many vectors with one search call per batch instead of one per vector."""
+        predicted_authors = []
+        for start in range(0, len(vectors), batch_size):
+            search_results = self.milvus_repo.search(query_vectors=vectors[start:start + batch_size], limit=limit)
+            predicted_authors.extend(PredictionService._author_from_hits(hits) for hits in search_results)
+        return predicted_authors
+
+    @staticmethod
+    def _author_from_hits(hits: list) -> str:
+        if not hits:
+            return None
+
+        # Deduplicated entries carry how many messages of each author they stand for
+        entity = hits[0]["entity"]
+        author_counts = entity.get("author_counts")
+        return DeduplicationService.majority_author(author_counts) if author_counts else entity["author"]
     
+    def predict_window(self, texts: list, selected_metrics: list, limit: int = 1) -> str:
+        """Predict the author of several consecutive messages as a single window.
+
+        The messages are joined and extracted the same way init.py builds the
+        windows it stores, so the query lives in the same vector space.
+        """
+        from services.feature_extraction_service import FeatureExtractionService
+        from services.numpy_service import NumpyService
+
+        text = ' '.join(texts)
+        metrics = FeatureExtractionService.extract(self._stylo, [text])
+        vector = NumpyService.to_float64_list(metrics.iloc[0, selected_metrics])
+        return self.predict_author(vector, limit=limit)
+
     def is_correct_prediction(self, predicted_author: str, actual_author: str) -> bool:
         return predicted_author == actual_author
     
     def evaluate_predictions(self, testing_vectors: list, testing_messages: list) -> dict:
+        predicted_authors = self.predict_authors(testing_vectors)
+        return PredictionService.summarize_predictions(predicted_authors, testing_messages)
+
+    @staticmethod
+    def summarize_predictions(predicted_authors: list, testing_messages: list) -> dict:
         correct_predictions = 0
-        total_predictions = len(testing_vectors)
+        total_predictions = len(testing_messages)
         human1_correct = 0
         human1_incorrect = 0
         human2_correct = 0
         human2_incorrect = 0
 
-        for i, test_vector in enumerate(testing_vectors):
-            predicted_author = self.predict_author(test_vector)
-
+        for i, predicted_author in enumerate(predicted_authors):
             if predicted_author is None:
                 continue
 
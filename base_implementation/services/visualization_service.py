@@ -1,9 +1,111 @@
-import matplotlib.pyplot as plt
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
+# matplotlib is imported inside the methods that draw, so importing this
+# module (e.g. to inspect a checkpoint) does not pay for it.
+
+
+def _render_job(method_name: str, kwargs: dict, dpi: int, output_format: str):
+    """Entry point of the worker processes used by render_many."""
+    VisualizationService.configure_headless(dpi=dpi, output_format=output_format)
+    return getattr(VisualizationService, method_name)(**kwargs)
+
+
 class VisualizationService:
+    # Interactive defaults; configure_headless() switches to Agg-only rendering.
+    show_plots = True
+    dpi = 300
+    output_format = None
+
+    @classmethod
+    def configure_headless(cls, dpi: int = 100, output_format: str = None):
+        """Render without a display: Agg backend, explicit figures, no plt.show().
+
+        output_format overrides the extension of every output_path (e.g. 'svg').
+        """
+        import matplotlib
+        matplotlib.use('Agg')
+        cls.show_plots = False
+        cls.dpi = dpi
+        cls.output_format = output_format
+
+    @staticmethod
+    def has_interactive_backend() -> bool:
+        """Whether matplotlib resolved to a GUI backend, i.e. plt.show() can display figures."""
+        import matplotlib
+        try:
+            from matplotlib.backends import BackendFilter, backend_registry
+            non_interactive = backend_registry.list_builtin(BackendFilter.NON_INTERACTIVE)
+        except ImportError:  # matplotlib < 3.9
+            from matplotlib.rcsetup import non_interactive_bk as non_interactive
+        return matplotlib.get_backend().lower() not in {backend.lower() for backend in non_interactive}
+
+    @classmethod
+    def _subplots(cls, *args, show: bool = None, **kwargs):
+        if cls.show_plots if show is None else show:
+            import matplotlib.pyplot as plt
+            return plt.subplots(*args, **kwargs)
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # Figures created outside of pyplot are not tracked by its global state,
+        # so they are garbage collected as soon as the caller drops them.
+        fig = Figure(figsize=kwargs.pop('figsize', None))
+        FigureCanvasAgg(fig)
+        return fig, fig.subplots(*args, **kwargs)
+
+    @staticmethod
+    def _output_path(output_path: str, output_format: str = None) -> str:
+        if output_format:
+            return f"{os.path.splitext(output_path)[0]}.{output_format}"
+        return output_path
+
+    @classmethod
+    def _save(cls, fig, output_path: str, show: bool = None, dpi: int = None) -> str:
+        output_path = cls._output_path(output_path, cls.output_format)
+
+        fig.savefig(output_path, dpi=dpi or cls.dpi, bbox_inches='tight')
+
+        if cls.show_plots if show is None else show:
+            import matplotlib.pyplot as plt
+            plt.show()
+            plt.close(fig)
+        return output_path
+
     @staticmethod
-    def create_accuracy_bar_chart(correct_predictions: int, incorrect_predictions: int, output_path: str = 'accuracy_chart.png'):
+    def render_many(jobs: list, workers: int = None, dpi: int = 100, output_format: str = None) -> list:
+        """Render charts in parallel worker processes, always headless.
+
+        Each job is a (method_name, kwargs) tuple, e.g.
+        ('create_confusion_matrix', {'results': results, 'output_path': 'cm_01.png'}).
+        Returns the path written by each job (None if it drew nothing), in job order.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_render_job, method_name, kwargs, dpi, output_format)
+                       for method_name, kwargs in jobs]
+            results = [future.result() for future in futures]
+
+        # Chart methods return different things (e.g. the confusion matrix
+        # returns cm), so the paths come from each job's own output_path
+        paths = []
+        for (method_name, kwargs), result in zip(jobs, results):
+            if result is None:
+                paths.append(None)
+                continue
+            output_path = kwargs.get('output_path')
+            if output_path is None:
+                method = getattr(VisualizationService, method_name)
+                output_path = inspect.signature(method).parameters['output_path'].default
+            paths.append(VisualizationService._output_path(output_path, output_format))
+        return paths
+
+    @staticmethod
+    def create_accuracy_bar_chart(correct_predictions: int, incorrect_predictions: int, output_path: str = 'accuracy_chart.png',
+                                  show: bool = None, dpi: int = None):
         total = correct_predictions + incorrect_predictions
         
         if total == 0:
@@ -14,7 +116,7 @@ class VisualizationService:
         values = [correct_predictions, incorrect_predictions]
         colors = ['#2ecc71', '#e74c3c']
         
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = VisualizationService._subplots(figsize=(10, 6), show=show)
         
         bars = ax.bar(categories, values, color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
         
@@ -34,23 +136,23 @@ class VisualizationService:
         ax.set_axisbelow(True)
         
         accuracy = (correct_predictions / total) * 100
-        plt.figtext(0.5, 0.02, f'Acurácia Total: {accuracy:.2f}% | Total de Predições: {total}',
+        fig.text(0.5, 0.02, f'Acurácia Total: {accuracy:.2f}% | Total de Predições: {total}',
                    ha='center', fontsize=10, bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
         
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.1)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.1)
         
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        output_path = VisualizationService._save(fig, output_path, show=show, dpi=dpi)
         print(f"Gráfico salvo em: {output_path}")
-        
-        plt.show()
+        return output_path
         
     @staticmethod
     def create_detailed_bar_chart(correct_predictions: int, incorrect_predictions: int, 
                                   human1_correct: int = 0, human1_incorrect: int = 0,
                                   human2_correct: int = 0, human2_incorrect: int = 0,
-                                  output_path: str = 'detailed_accuracy_chart.png'):
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+                                  output_path: str = 'detailed_accuracy_chart.png',
+                                  show: bool = None, dpi: int = None):
+        fig, (ax1, ax2) = VisualizationService._subplots(1, 2, figsize=(14, 6), show=show)
         
         categories_total = ['Acertos', 'Falhas']
         values_total = [correct_predictions, incorrect_predictions]
@@ -103,16 +205,17 @@ class VisualizationService:
             ax2.set_title('Resultado por Autor', fontsize=12, fontweight='bold')
         
         accuracy = (correct_predictions / total) * 100 if total > 0 else 0
-        plt.suptitle(f'Análise de Identificação de Autor - Acurácia: {accuracy:.2f}%', 
+        fig.suptitle(f'Análise de Identificação de Autor - Acurácia: {accuracy:.2f}%', 
                     fontsize=14, fontweight='bold', y=1.02)
         
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.tight_layout()
+        output_path = VisualizationService._save(fig, output_path, show=show, dpi=dpi)
         print(f"Gráfico detalhado salvo em: {output_path}")
-        plt.show()
+        return output_path
 
     @staticmethod
-    def create_confusion_matrix(results: dict = None, output_path: str = 'confusion_matrix.png'):
+    def create_confusion_matrix(results: dict = None, output_path: str = 'confusion_matrix.png',
+                                show: bool = None, dpi: int = None):
         if results is None:
             print("Erro: 'results' não fornecido. Não é possível gerar a matriz de confusão.")
             return None
@@ -125,8 +228,8 @@ class VisualizationService:
         cm = np.array([[h1_correct, h1_incorrect],
                        [h2_incorrect, h2_correct]])
 
-        fig, ax = plt.subplots(figsize=(6, 5))
-        im = ax.imshow(cm, interpolation='nearest', cmap=plt.cm.Blues)
+        fig, ax = VisualizationService._subplots(figsize=(6, 5), show=show)
+        im = ax.imshow(cm, interpolation='nearest', cmap='Blues')
 
         thresh = cm.max() / 2. if cm.max() > 0 else 0
         for i in range(cm.shape[0]):
@@ -147,8 +250,93 @@ class VisualizationService:
         cbar = fig.colorbar(im, ax=ax)
         cbar.ax.set_ylabel('Contagem', rotation=270, labelpad=15)
 
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        fig.tight_layout()
+        VisualizationService._save(fig, output_path, show=show, dpi=dpi)
 
         return cm
+
+    @staticmethod
+    def _feature_label(feature_idx: int, feature_names: list = None) -> str:
+        if feature_names and 0 <= feature_idx < len(feature_names):
+            return f"{feature_idx}: {feature_names[feature_idx]}"
+        return str(feature_idx)
+
+    @staticmethod
+    def create_selection_curve(results_history: list, feature_names: list = None,
+                               output_path: str = 'selection_curve.png',
+                               show: bool = None, dpi: int = None):
+        if not results_history:
+            print("Erro: Histórico de seleção vazio.")
+            return None
+
+        counts = [entry['features_count'] for entry in results_history]
+        accuracies = [entry['accuracy'] for entry in results_history]
+
+        fig, ax = VisualizationService._subplots(figsize=(12, 6), show=show)
+
+        ax.plot(counts, accuracies, marker='o', color='#2980b9', linewidth=2)
+
+        for entry in results_history:
+            added = entry['feature_added']
+            label = ('Conjunto inicial' if isinstance(added, list)
+                     else VisualizationService._feature_label(added, feature_names))
+            ax.annotate(label, (entry['features_count'], entry['accuracy']),
+                        textcoords='offset points', xytext=(0, 8),
+                        ha='left', fontsize=7, rotation=45)
+
+        ax.set_xlabel('Quantidade de Features', fontsize=11, fontweight='bold')
+        ax.set_ylabel('Acurácia (%)', fontsize=11, fontweight='bold')
+        ax.set_title('Forward Selection - Acurácia vs Quantidade de Features',
+                     fontsize=13, fontweight='bold')
+        ax.set_ylim(min(accuracies) - 5, max(accuracies) + 10)
+        ax.yaxis.grid(True, linestyle='--', alpha=0.7)
+        ax.set_axisbelow(True)
+
+        fig.tight_layout()
+        return VisualizationService._save(fig, output_path, show=show, dpi=dpi)
+
+    @staticmethod
+    def create_candidate_heatmap(entry: dict, total_features: int, feature_names: list = None,
+                                 baseline_accuracy: float = None, top_n: int = 10,
+                                 output_path: str = 'candidates.png',
+                                 show: bool = None, dpi: int = None):
+        candidate_scores = {int(k): v for k, v in entry.get('candidate_scores', {}).items()}
+        if not candidate_scores:
+            print(f"Erro: Iteração {entry.get('iteration')} sem pontuações de candidatos.")
+            return None
+
+        # Already selected features have no score in this iteration and stay blank
+        if baseline_accuracy is None:
+            baseline_accuracy = min(candidate_scores.values())
+        gains = np.full((1, total_features), np.nan)
+        for feature_idx, accuracy in candidate_scores.items():
+            gains[0, feature_idx] = accuracy - baseline_accuracy
+
+        fig, ax = VisualizationService._subplots(figsize=(14, 3.5), show=show)
+
+        limit = np.nanmax(np.abs(gains)) or 1.0
+        im = ax.imshow(gains, aspect='auto', cmap='RdYlGn', vmin=-limit, vmax=limit,
+                       interpolation='nearest')
+
+        top = sorted(candidate_scores, key=candidate_scores.get, reverse=True)[:top_n]
+        ax.set_xticks(top)
+        ax.set_xticklabels([VisualizationService._feature_label(f, feature_names) for f in top],
+                           rotation=60, ha='right', fontsize=7)
+        ax.set_yticks([])
+        ax.set_xlabel('Feature candidata', fontsize=10, fontweight='bold')
+
+        added = entry.get('feature_added')
+        if added is None:
+            added_label = 'nenhuma'
+        elif isinstance(added, list):
+            added_label = 'conjunto inicial'
+        else:
+            added_label = VisualizationService._feature_label(added, feature_names)
+        ax.set_title(f"Iteração {entry.get('iteration')} - Ganho de acurácia por candidata "
+                     f"(adicionada: {added_label})", fontsize=11, fontweight='bold')
+
+        cbar = fig.colorbar(im, ax=ax, pad=0.01)
+        cbar.ax.set_ylabel('Δ Acurácia (p.p.)', rotation=270, labelpad=15)
+
+        fig.tight_layout()
+        return VisualizationService._save(fig, output_path, show=show, dpi=dpi)
@@ -0,0 +1,73 @@
+import sys
+import os
+import json
+import subprocess
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPLEMENTATION_DIR = os.path.join(BASE_DIR, '../base_implementation')
+
+# Entry modules must import within the budget without touching these
+HEAVY_MODULES = ['stylo_metrix', 'spacy', 'pymilvus', 'pandas', 'matplotlib']
+ENTRY_MODULES = ['run_selection', 'forward_selection', 'selection_report', 'init', 'compare_feature_sets']
+IMPORT_BUDGET_SECONDS = 0.5
+# Wall time of the whole process, interpreter startup included
+INSPECT_BUDGET_SECONDS = 1.0
+RUNS = 3
+
+IMPORT_PROBE = """
+import json, sys, time
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """Best of RUNS imports of module, each in a fresh interpreter."""
+    code = IMPORT_PROBE.format(paths=[BASE_DIR, IMPLEMENTATION_DIR], module=module, heavy=HEAVY_MODULES)
+    best = None
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=BASE_DIR)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def measure_inspect() -> float:
+    """Best of RUNS wall times of `run_selection.py --inspect`."""
+    best = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(BASE_DIR, 'run_selection.py'), '--inspect'],
+                       capture_output=True, check=True, cwd=BASE_DIR)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> int:
+    failures = 0
+
+    print(f"Orçamento de importação: {IMPORT_BUDGET_SECONDS:.2f}s por módulo")
+    for module in ENTRY_MODULES:
+        result = measure_import(module)
+        ok = result['seconds'] <= IMPORT_BUDGET_SECONDS and not result['heavy']
+        failures += not ok
+        heavy = f" (importou: {', '.join(result['heavy'])})" if result['heavy'] else ''
+        print(f"  {'OK  ' if ok else 'FAIL'} {module}: {result['seconds']:.3f}s{heavy}")
+
+    inspect_seconds = measure_inspect()
+    ok = inspect_seconds <= INSPECT_BUDGET_SECONDS
+    failures += not ok
+    print(f"  {'OK  ' if ok else 'FAIL'} run_selection.py --inspect: {inspect_seconds:.3f}s "
+          f"(orçamento {INSPECT_BUDGET_SECONDS:.2f}s)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
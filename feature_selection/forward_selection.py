@@ -3,14 +3,11 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../base_implementation'))
 
-import stylo_metrix as sm
 from chat_reader import read_human_chat
-from repositories.milvus_repository import MilvusRepository
-from services.pandas_service import PandasService
 from services.numpy_service import NumpyService
+from services.deduplication_service import DeduplicationService
 from models.message import Message
 from services.prediction_service import PredictionService
-import pandas as pd
 import json
 import traceback
 from datetime import datetime
@@ -21,11 +18,19 @@ INITIAL_SELECTED_METRICS = [
 
 
 class ForwardSelection:
-    def __init__(self, chat_file_path: str, max_features: int = 60, checkpoint_file: str = 'forward_selection_checkpoint.json'):
+    def __init__(self, chat_file_path: str, max_features: int = 60, checkpoint_file: str = 'forward_selection_checkpoint.json',
+                 reporter=None, search_backend: str = 'milvus', memory_budget_mb: float = 256,
+                 cache_dir: str = None, deduplicate: bool = False):
         self.chat_file_path = chat_file_path
         self.max_features = max_features
         self.checkpoint_file = checkpoint_file
-        self.stylo = sm.StyloMetrix('en')
+        self.reporter = reporter
+        self.search_backend = search_backend
+        self.memory_budget_mb = memory_budget_mb
+        self.cache_dir = cache_dir
+        # Collapse repeated training messages like init.py's DEDUPLICATE; keep the
+        # same setting in both to compare their accuracies
+        self.deduplicate = deduplicate
         
         self.chat_messages = read_human_chat(chat_file_path)
         self.texts = [msg['texto'] for msg in self.chat_messages]
@@ -36,23 +41,64 @@ class ForwardSelection:
         self.testing_texts = self.texts[training_size:]
         self.testing_messages = self.chat_messages[training_size:]
         
-        print("Extracting training metrics...")
-        self.training_metrics_full = self.stylo.transform(self.training_texts)
-        PandasService.clean_non_numeric_metrics(self.training_metrics_full)
-        
-        print("Extracting testing metrics...")
-        self.testing_metrics_full = self.stylo.transform(self.testing_texts)
-        PandasService.clean_non_numeric_metrics(self.testing_metrics_full)
+        # Repeated texts keep the metrics row of their first occurrence
+        if self.deduplicate:
+            self.training_entries, self.training_rows = \
+                DeduplicationService.collapse_by_text_with_rows(self.training_messages)
         
-        self.total_features = self.training_metrics_full.shape[1]
-        print(f"Total features available: {self.total_features}")
+        # Metrics (and the spaCy model behind them) are only loaded by
+        # _ensure_metrics(), so inspecting or resuming a checkpoint is cheap
+        self._training_metrics_full = None
+        self._testing_metrics_full = None
+        self.total_features = None
+        self.feature_names = None
         
         self.selected_features = []
-        self.available_features = list(range(self.total_features))
+        self.available_features = []
         self.results_history = []
+        # Candidate scores of iterations that added no feature, one per selected set
+        self.stalled_iterations = []
         
         # Try to load checkpoint
         self._load_checkpoint()
+    
+    @property
+    def training_metrics_full(self):
+        self._ensure_metrics()
+        return self._training_metrics_full
+    
+    @property
+    def testing_metrics_full(self):
+        self._ensure_metrics()
+        return self._testing_metrics_full
+    
+    def _ensure_metrics(self):
+        """Extract (or load from cache) the full metrics of both splits on first use."""
+        if self._training_metrics_full is not None:
+            return
+        
+        from services.feature_extraction_service import FeatureExtractionService
+        
+        print("Extracting training metrics...")
+        self._training_metrics_full = FeatureExtractionService.extract(None, self.training_texts, cache_dir=self.cache_dir)
+        
+        print("Extracting testing metrics...")
+        self._testing_metrics_full = FeatureExtractionService.extract(None, self.testing_texts, cache_dir=self.cache_dir)
+        
+        total_features = self._training_metrics_full.shape[1]
+        print(f"Total features available: {total_features}")
+        
+        if self.total_features is not None and self.total_features != total_features:
+            print("⚠ Warning: Checkpoint parameters don't match current data!")
+            print("  Starting fresh instead of loading checkpoint.")
+            self.selected_features = []
+            self.results_history = []
+            self.stalled_iterations = []
+        
+        self.total_features = total_features
+        self.feature_names = [str(name) for name in self._training_metrics_full.columns]
+        self.available_features = [f for f in range(self.total_features) 
+                                   if f not in self.selected_features]
         
     def _load_checkpoint(self):
         """Load checkpoint if it exists and continue from there."""
@@ -65,17 +111,21 @@ class ForwardSelection:
                 with open(self.checkpoint_file, 'r') as f:
                     checkpoint = json.load(f)
                 
-                # Validate checkpoint matches current configuration
-                if (checkpoint['parameters']['total_features_available'] != self.total_features or
-                    checkpoint['parameters']['training_size'] != len(self.training_texts) or
-                    checkpoint['parameters']['testing_size'] != len(self.testing_texts)):
+                # Validate checkpoint matches current configuration; the feature
+                # count is checked again once metrics are extracted
+                if (checkpoint['parameters']['training_size'] != len(self.training_texts) or
+                    checkpoint['parameters']['testing_size'] != len(self.testing_texts) or
+                    checkpoint['parameters'].get('deduplicate', False) != self.deduplicate):
                     print("⚠ Warning: Checkpoint parameters don't match current data!")
                     print("  Starting fresh instead of loading checkpoint.")
                     return
                 
                 # Load state
+                self.total_features = checkpoint['parameters']['total_features_available']
+                self.feature_names = checkpoint.get('feature_names')
                 self.selected_features = checkpoint['selected_features']
                 self.results_history = checkpoint['results_history']
+                self.stalled_iterations = checkpoint.get('stalled_iterations', [])
                 
                 # Rebuild available features
                 self.available_features = [f for f in range(self.total_features) 
@@ -91,9 +141,12 @@ class ForwardSelection:
             except Exception as e:
                 print(f"⚠ Error loading checkpoint: {e}")
                 print("  Starting fresh instead.")
+                self.total_features = None
+                self.feature_names = None
                 self.selected_features = []
-                self.available_features = list(range(self.total_features))
+                self.available_features = []
                 self.results_history = []
+                self.stalled_iterations = []
         else:
             print(f"No checkpoint file found. Starting fresh.")
     
@@ -105,11 +158,14 @@ class ForwardSelection:
                 'max_features': self.max_features,
                 'training_size': len(self.training_texts),
                 'testing_size': len(self.testing_texts),
-                'total_features_available': self.total_features
+                'total_features_available': self.total_features,
+                'deduplicate': self.deduplicate
             },
+            'feature_names': self.feature_names,
             'selected_features': self.selected_features,
             'final_accuracy': self.results_history[-1]['accuracy'] if self.results_history else 0,
-            'results_history': self.results_history
+            'results_history': self.results_history,
+            'stalled_iterations': self.stalled_iterations
         }
         
         try:
@@ -118,6 +174,58 @@ class ForwardSelection:
             print(f"  💾 Checkpoint saved: {self.checkpoint_file}")
         except Exception as e:
             print(f"  ⚠ Error saving checkpoint: {e}")
+        
+        self._update_report()
+    
+    def _update_report(self):
+        """Stream the current history to the reporter, if one was given."""
+        if self.reporter is None:
+            return
+        try:
+            self.reporter.update(self.results_history, self.feature_names, self.total_features,
+                                 stalled_iterations=self.stalled_iterations)
+        except Exception as e:
+            print(f"  ⚠ Error updating report: {e}")
+    
+    def _create_repository(self, collection_name: str, dimensions_count: int):
+        """Milvus collection, or an in-memory exact search when search_backend == 'exact'."""
+        if self.search_backend == 'exact':
+            from repositories.exact_repository import ExactSearchRepository
+            return ExactSearchRepository(
+                collection_name=collection_name,
+                dimensions_count=dimensions_count,
+                memory_budget_mb=self.memory_budget_mb
+            )
+        from repositories.milvus_repository import MilvusRepository
+        return MilvusRepository(collection_name=collection_name, dimensions_count=dimensions_count)
+    
+    def _training_data(self, training_metrics) -> list:
+        """Training messages to insert, collapsed by text and vector when deduplicate is on."""
+        if not self.deduplicate:
+            data = []
+            for i in range(len(training_metrics)):
+                data.append(Message(
+                    id=i,
+                    content=self.training_texts[i],
+                    author=self.training_messages[i]['nomePessoa'],
+                    vector=NumpyService.to_float64_list(training_metrics.iloc[i])
+                ))
+            return data
+        
+        vectors = [NumpyService.to_float64_list(training_metrics.iloc[row]) for row in self.training_rows]
+        entries, vectors = DeduplicationService.collapse_by_vector(self.training_entries, vectors)
+        
+        data = []
+        for i in range(len(vectors)):
+            data.append(Message(
+                id=i,
+                content=entries[i]['texto'],
+                author=entries[i]['nomePessoa'],
+                vector=vectors[i],
+                weight=entries[i]['weight'],
+                author_counts=entries[i]['author_counts']
+            ))
+        return data
     
     def evaluate_feature_set(self, feature_indices: list) -> float:
         """Evaluate a specific set of features and return accuracy."""
@@ -135,24 +243,17 @@ class ForwardSelection:
         training_metrics = self.training_metrics_full.iloc[:, feature_indices]
         testing_metrics = self.testing_metrics_full.iloc[:, feature_indices]
         
-        print(f"  [Evaluate] Creating Milvus repository...")
-        milvus_repo = MilvusRepository(
+        print(f"  [Evaluate] Creating {self.search_backend} repository...")
+        milvus_repo = self._create_repository(
             collection_name=f"forward_selection_{len(feature_indices)}", 
             dimensions_count=len(feature_indices)
         )
         
         print(f"  [Evaluate] Initializing prediction service...")
-        prediction_service = PredictionService(milvus_repo=milvus_repo, stylo=self.stylo)
+        prediction_service = PredictionService(milvus_repo=milvus_repo)
         
         print(f"  [Evaluate] Preparing training data ({len(training_metrics)} samples)...")
-        data = []
-        for i in range(len(training_metrics)):
-            data.append(Message(
-                id=i,
-                content=self.training_texts[i],
-                author=self.training_messages[i]['nomePessoa'],
-                vector=NumpyService.to_float64_list(training_metrics.iloc[i])
-            ))
+        data = self._training_data(training_metrics)
         
         print(f"  [Evaluate] Inserting training data into Milvus...")
         milvus_repo.insert_data([msg.to_dict() for msg in data])
@@ -172,12 +273,16 @@ class ForwardSelection:
         return accuracy
     
     def run(self):
+        self._ensure_metrics()
+        
         print("\n" + "="*80)
         print("Starting Forward Selection Algorithm")
         print("="*80)
         print(f"Maximum features: {self.max_features}")
         print(f"Training samples: {len(self.training_texts)}")
         print(f"Testing samples: {len(self.testing_texts)}")
+        if self.deduplicate:
+            print(f"Deduplicated training texts: {len(self.training_texts)} -> {len(self.training_rows)}")
         print(f"Starting with {len(INITIAL_SELECTED_METRICS)} features from init.py")
         print("="*80 + "\n")
         
@@ -237,6 +342,7 @@ class ForwardSelection:
             
             best_feature = None
             best_feature_accuracy = best_accuracy
+            candidate_scores = {}
             
             print(f"\n[Main] Testing {len(self.available_features)} features sequentially...")
             print(f"[Main] Features to test: {self.available_features[:10]}{'...' if len(self.available_features) > 10 else ''}\n")
@@ -254,21 +360,14 @@ class ForwardSelection:
                     training_metrics = self.training_metrics_full.iloc[:, candidate_features]
                     testing_metrics = self.testing_metrics_full.iloc[:, candidate_features]
                     
-                    milvus_repo = MilvusRepository(
+                    milvus_repo = self._create_repository(
                         collection_name=f"forward_selection_{len(candidate_features)}_{feature_idx}", 
                         dimensions_count=len(candidate_features)
                     )
                     
-                    prediction_service = PredictionService(milvus_repo=milvus_repo, stylo=self.stylo)
+                    prediction_service = PredictionService(milvus_repo=milvus_repo)
                     
-                    data = []
-                    for i in range(len(training_metrics)):
-                        data.append(Message(
-                            id=i,
-                            content=self.training_texts[i],
-                            author=self.training_messages[i]['nomePessoa'],
-                            vector=NumpyService.to_float64_list(training_metrics.iloc[i])
-                        ))
+                    data = self._training_data(training_metrics)
                     
                     milvus_repo.insert_data([msg.to_dict() for msg in data])
                     
@@ -280,6 +379,7 @@ class ForwardSelection:
                     results = prediction_service.evaluate_predictions(testing_vectors, self.testing_messages)
                     
                     accuracy = results['accuracy']
+                    candidate_scores[feature_idx] = accuracy
                     
                     if accuracy > best_feature_accuracy:
                         best_feature_accuracy = accuracy
@@ -304,7 +404,8 @@ class ForwardSelection:
                     'feature_added': best_feature,
                     'selected_features': self.selected_features.copy(),
                     'accuracy': best_accuracy,
-                    'features_count': len(self.selected_features)
+                    'features_count': len(self.selected_features),
+                    'candidate_scores': candidate_scores
                 }
                 self.results_history.append(result)
                 
@@ -323,6 +424,19 @@ class ForwardSelection:
                 print(f"  Best accuracy achieved: {best_feature_accuracy:.2f}%")
                 print(f"  Current best: {best_accuracy:.2f}%")
                 
+                # Keep the candidate scores so the report shows where selection stalled;
+                # a retry with the same selected features replaces the previous record
+                self.stalled_iterations = [entry for entry in self.stalled_iterations
+                                           if entry['selected_features'] != self.selected_features]
+                self.stalled_iterations.append({
+                    'iteration': iteration + 1,
+                    'feature_added': None,
+                    'selected_features': self.selected_features.copy(),
+                    'accuracy': best_accuracy,
+                    'features_count': len(self.selected_features),
+                    'candidate_scores': candidate_scores
+                })
+                
                 # Save checkpoint even when no improvement
                 self._save_checkpoint()
                 
@@ -349,11 +463,14 @@ class ForwardSelection:
                 'max_features': self.max_features,
                 'training_size': len(self.training_texts),
                 'testing_size': len(self.testing_texts),
-                'total_features_available': self.total_features
+                'total_features_available': self.total_features,
+                'deduplicate': self.deduplicate
             },
+            'feature_names': self.feature_names,
             'selected_features': self.selected_features,
             'final_accuracy': self.results_history[-1]['accuracy'] if self.results_history else 0,
-            'results_history': self.results_history
+            'results_history': self.results_history,
+            'stalled_iterations': self.stalled_iterations
         }
         
         with open(output_file, 'w') as f:
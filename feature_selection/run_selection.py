@@ -1,17 +1,64 @@
 import sys
 import os
+import json
+import argparse
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '../base_implementation'))
 sys.path.append(os.path.dirname(__file__))
 
 from forward_selection import ForwardSelection
+from selection_report import SelectionReport
 
 
-def main():
-    print("Iniciando Forward Selection...")
+def inspect_checkpoint(checkpoint_file: str):
+    """Print the state of a checkpoint without loading the NLP model or the chat."""
+    if not os.path.exists(checkpoint_file):
+        print(f"Nenhum checkpoint encontrado: {checkpoint_file}")
+        return
     
+    with open(checkpoint_file, 'r') as f:
+        checkpoint = json.load(f)
+    
+    history = checkpoint.get('results_history', [])
+    print("="*80)
+    print(f"Checkpoint: {checkpoint_file}")
+    print("="*80)
+    print(f"Salvo em: {checkpoint.get('timestamp')}")
+    print(f"Parâmetros: {checkpoint.get('parameters')}")
+    print(f"Features selecionadas ({len(checkpoint.get('selected_features', []))}): {checkpoint.get('selected_features')}")
+    print(f"Acurácia atual: {checkpoint.get('final_accuracy', 0):.2f}%")
+    print(f"Iterações concluídas: {len(history)}")
+    for entry in history:
+        print(f"  Iteração {entry['iteration']}: +{entry['feature_added']} -> "
+              f"{entry['accuracy']:.2f}% ({entry['features_count']} features)")
+    print("="*80)
+
+
+def main():
+    base_dir = os.path.dirname(__file__)
     chat_file = '/home/matheus/github/Clustering/StyloMetrix/Datasets/human_chat.txt'
-    checkpoint_file = os.path.join(os.path.dirname(__file__), 'forward_selection_checkpoint.json')
+    checkpoint_file = os.path.join(base_dir, 'forward_selection_checkpoint.json')
+    report_dir = os.path.join(base_dir, 'selection_report')
+    
+    parser = argparse.ArgumentParser(description='Forward Selection de métricas do StyloMetrix.')
+    parser.add_argument('--inspect', action='store_true', help='Apenas mostra o estado do checkpoint')
+    parser.add_argument('--report', action='store_true', help='Apenas atualiza o relatório a partir do checkpoint')
+    parser.add_argument('--search-backend', default='milvus', choices=['milvus', 'exact'])
+    parser.add_argument('--deduplicate', action='store_true',
+                        help='Colapsa mensagens de treino repetidas, como DEDUPLICATE em init.py')
+    args = parser.parse_args()
+    
+    if args.inspect:
+        inspect_checkpoint(checkpoint_file)
+        return
+    
+    if args.report:
+        report = SelectionReport(output_dir=report_dir)
+        written = report.update_from_file(checkpoint_file)
+        print(f"Relatório atualizado em: {report_dir} ({len(written)} arquivo(s) gerado(s))")
+        return
+    
+    print("Iniciando Forward Selection...")
     
     if not os.path.exists(chat_file):
         print(f"Erro: Arquivo não encontrado: {chat_file}")
@@ -21,7 +68,11 @@ def main():
     selector = ForwardSelection(
         chat_file_path=chat_file,
         max_features=60,
-        checkpoint_file=checkpoint_file
+        checkpoint_file=checkpoint_file,
+        reporter=SelectionReport(output_dir=report_dir),
+        search_backend=args.search_backend,
+        deduplicate=args.deduplicate,
+        cache_dir=os.path.join(base_dir, 'metrics_cache')
     )
     
     results = selector.run()
@@ -37,6 +88,7 @@ def main():
     print(f"Acurácia final: {results['final_accuracy']:.2f}%")
     print(f"Total de iterações: {results['total_iterations']}")
     print(f"Resultados salvos em: {output_file}")
+    print(f"Relatório salvo em: {selector.reporter.output_dir}")
     print("="*80)
 
 
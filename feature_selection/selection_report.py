@@ -0,0 +1,135 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../base_implementation'))
+
+from services.visualization_service import VisualizationService
+import hashlib
+import json
+
+
+class SelectionReport:
+    """Incremental charts for a forward selection run.
+
+    Keeps a small state file next to the charts with a signature of every
+    rendered entry, so each update only renders entries that are new or whose
+    content changed (e.g. after a restarted run reused the same iteration
+    numbers). The selection curve is redrawn whenever the history changes.
+    """
+
+    def __init__(self, output_dir: str = 'selection_report', dpi: int = 100, output_format: str = 'png'):
+        self.output_dir = output_dir
+        self.dpi = dpi
+        self.output_format = output_format
+        self.state_file = os.path.join(output_dir, 'report_state.json')
+        os.makedirs(output_dir, exist_ok=True)
+        self.state = self._load_state()
+
+    def _load_state(self) -> dict:
+        state = {'curve_signature': None, 'rendered': {}}
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r') as f:
+                state.update(json.load(f))
+        return state
+
+    def _save_state(self):
+        with open(self.state_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, f"{name}.{self.output_format}")
+
+    @staticmethod
+    def _signature(entry: dict) -> str:
+        # candidate_scores keys are ints in memory and strings once reloaded from JSON
+        normalized = {**entry, 'candidate_scores': {str(k): v for k, v in entry.get('candidate_scores', {}).items()}}
+        return hashlib.sha1(json.dumps(normalized, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def update(self, results_history: list, feature_names: list = None, total_features: int = None,
+               stalled_iterations: list = None) -> list:
+        """Render whatever is new or changed in the history and return the written paths."""
+        written = []
+        stalled_iterations = stalled_iterations or []
+
+        if total_features is None:
+            total_features = len(feature_names) if feature_names else 0
+            for entry in results_history + stalled_iterations:
+                scored = [int(k) for k in entry.get('candidate_scores', {})]
+                total_features = max([total_features, *(f + 1 for f in scored)])
+
+        # Stalled entries are compared against the accuracy they failed to beat
+        heatmaps = {}
+        for position, entry in enumerate(results_history):
+            baseline = results_history[position - 1]['accuracy'] if position > 0 else None
+            heatmaps[f"candidates_iter_{entry['iteration']:03d}"] = (entry, baseline)
+        for entry in stalled_iterations:
+            heatmaps[f"candidates_iter_{entry['iteration']:03d}_stalled"] = (entry, entry['accuracy'])
+
+        rendered = {}
+        for name, (entry, baseline) in heatmaps.items():
+            if not entry.get('candidate_scores'):
+                continue
+
+            signature = self._signature(entry)
+            if self.state['rendered'].get(name) != signature:
+                path = VisualizationService.create_candidate_heatmap(
+                    entry,
+                    total_features=total_features,
+                    feature_names=feature_names,
+                    baseline_accuracy=baseline,
+                    output_path=self._path(name),
+                    show=False,
+                    dpi=self.dpi
+                )
+                if path:
+                    written.append(path)
+            rendered[name] = signature
+
+        # Heatmaps of a previous run that the current history no longer has
+        for name in set(self.state['rendered']) - set(rendered):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+
+        curve_signature = hashlib.sha1(
+            ''.join(self._signature(entry) for entry in results_history).encode('utf-8')).hexdigest()
+        if results_history and curve_signature != self.state['curve_signature']:
+            path = VisualizationService.create_selection_curve(
+                results_history,
+                feature_names=feature_names,
+                output_path=self._path('selection_curve'),
+                show=False,
+                dpi=self.dpi
+            )
+            if path:
+                written.append(path)
+
+        self.state = {'curve_signature': curve_signature, 'rendered': rendered}
+        self._save_state()
+
+        return written
+
+    def update_from_file(self, results_file: str) -> list:
+        """Update the report from a checkpoint or results JSON file."""
+        with open(results_file, 'r') as f:
+            results = json.load(f)
+
+        return self.update(
+            results.get('results_history', []),
+            feature_names=results.get('feature_names'),
+            total_features=results.get('parameters', {}).get('total_features_available'),
+            stalled_iterations=results.get('stalled_iterations')
+        )
+
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    results_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, 'forward_selection_checkpoint.json')
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, 'selection_report')
+
+    VisualizationService.configure_headless()
+    report = SelectionReport(output_dir=output_dir)
+    written = report.update_from_file(results_file)
+
+    print(f"Relatório atualizado em: {output_dir}")
+    for path in written:
+        print(f"  {path}")